@@ -4,6 +4,8 @@ Tune these parameters to alter the simulation's behavior and the
 likelihood of deadlocks.
 """
 
+import os
+
 # --- Simulation Setup ---
 NUM_CLIENTS = 10
 NUM_TABLES = 4          # Lower number increases resource contention
@@ -18,6 +20,11 @@ WRITE_PROBABILITY = 0.5
 # A two-table transaction is required to create a deadlock.
 MULTI_TABLE_TX_PROBABILITY = 0.4
 
+# When True, transactions lock their tables in name order and skip the
+# deadlock window below. A global lock order makes deadlocks impossible,
+# which is useful as a contention baseline.
+SAFE_LOCK_ORDER = False
+
 # --- Timing (in seconds) ---
 # Duration of a simulated READ operation.
 READ_DURATION_RANGE = (2, 5)
@@ -30,4 +37,31 @@ WRITE_DURATION_RANGE = (3, 6)
 DEADLOCK_WINDOW_RANGE = (0.1, 0.4)
 
 # Cooldown period for a client after completing an operation.
-CLIENT_COOLDOWN_RANGE = (1, 2)
\ No newline at end of file
+CLIENT_COOLDOWN_RANGE = (1, 2)
+
+# Timeout (min, max) of each attempt to acquire a table lock. A blocked client
+# doubles its timeout after every failed attempt and checks for shutdown in
+# between, so it never stays stuck in a lock after the simulation ends.
+LOCK_RETRY_TIMEOUT_RANGE = (0.01, 1.0)
+
+# --- Logging ---
+# Minimum level of messages printed by the simulation. Use "DEBUG" to also see
+# every lock acquisition and release, or "WARNING" to silence the
+# per-operation logs (e.g. for benchmark runs).
+LOG_LEVEL = "INFO"
+
+# Optional path of a file that also receives every log line, taken from the
+# LAMPORT_LOG environment variable. None (unset) disables it.
+LOG_FILE = os.environ.get("LAMPORT_LOG")
+
+# Maximum number of log records waiting to be written. When a burst fills the
+# queue, new records are dropped (and counted) instead of growing memory.
+LOG_QUEUE_SIZE = 8192
+
+# --- Visualization ---
+# Optional file path where Wait-For Graphs are saved instead of being shown in
+# a window (e.g. "wait_for_graph.png"). Each plot overwrites it. Setting it is
+# recommended: plots are drawn from the DBA-Monitor thread, and GUI backends
+# (Tk, Qt) only support windows on the main thread, so live plotting may fail or
+# leave an unresponsive window between snapshots.
+GRAPH_SAVE_PATH = None
@@ -1,25 +1,25 @@
 import threading
-import time
 import sys
 import config
-from src.utils import log
+from src.utils import log, setup_logging
 from src.db_resources import Table
 from src.db_system import LockManager, ClientConnection
 from src.snapshot import Snapshotter
 
 def main():
     """Main function to set up and run the DBMS deadlock simulation."""
+    setup_logging()
     log("Starting Database Deadlock Detection Simulation.")
     shutdown_event = threading.Event()
 
     tables = [Table(f"tbl_{i+1:02d}") for i in range(config.NUM_TABLES)]
-    log(f"Database tables available: {[t.name for t in tables]}")
+    log("Database tables available: %s", [t.name for t in tables])
     
     # Create the central Lock Manager
     lock_manager = LockManager(tables, shutdown_event)
     
     # Create Client Connections (threads)
-    log(f"Opening {config.NUM_CLIENTS} client connections...")
+    log("Opening %d client connections...", config.NUM_CLIENTS)
     client_threads = []
     for i in range(config.NUM_CLIENTS):
         client_name = f"Client-{i+1}"
@@ -33,13 +33,14 @@ def main():
     # Start all threads
     log("Starting all client connections...")
     for thread in client_threads:
-        time.sleep(0.3)
         thread.start()
     snapshotter.start()
 
     try:
-        while not shutdown_event.is_set():
-            time.sleep(0.5)
+        # Wakes up as soon as the event is set; the timeout only keeps the
+        # main thread responsive to Ctrl+C.
+        while not shutdown_event.wait(0.5):
+            pass
         log("Shutdown initiated. MainThread is exiting.")
     except KeyboardInterrupt:
         log("Ctrl+C received! Initiating shutdown...")
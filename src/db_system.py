@@ -2,14 +2,13 @@ import threading
 import time
 import random
 import config
-from src.utils import log
-from src.snapshot import DeadlockDetector
+from src.utils import debug, log
+from src.snapshot import ClientState, DeadlockDetector
 
 class LockManager:
     def __init__(self, tables, shutdown_event):
         self.tables = {t.name: t for t in tables}
         self.connections = {}
-        self.snapshot_lock = threading.Lock()
         self.shutdown_event = shutdown_event
         self.deadlock_detector = DeadlockDetector(self.shutdown_event)
 
@@ -19,45 +18,52 @@ class LockManager:
     def acquire_lock(self, connection, table_name):
         table = self.tables.get(table_name)
         if not table: return
-        log(f"Attempting to acquire WRITE lock on '{table.name}'...")
-        connection.waiting_for_table = table
-        
-        table.write_lock.acquire()
+        debug("Attempting to acquire WRITE lock on '%s'...", table.name)
+        connection.lock_state = (connection.lock_state[0], table)
         
+        retry_timeout, max_retry_timeout = config.LOCK_RETRY_TIMEOUT_RANGE
+        while not table.write_lock.acquire(timeout=retry_timeout):
+            if self.shutdown_event.is_set():
+                return
+            retry_timeout = min(retry_timeout * 2, max_retry_timeout)
+
         if self.shutdown_event.is_set():
             table.write_lock.release()
             return
 
-        log(f"ACQUIRED write lock on '{table.name}'.")
-        connection.locked_tables.add(table)
+        debug("ACQUIRED write lock on '%s'.", table.name)
+        connection.lock_state = (connection.lock_state[0] | {table}, None)
         table.lock_owner = connection
-        connection.waiting_for_table = None
 
     def release_lock(self, connection, table_name):
         table = self.tables.get(table_name)
-        if not table or table not in connection.locked_tables: return
+        locked_tables, waiting_for_table = connection.lock_state
+        if not table or table not in locked_tables: return
         
         if table.lock_owner == connection:
-            connection.locked_tables.remove(table)
+            connection.lock_state = (locked_tables - {table}, waiting_for_table)
             table.lock_owner = None
             try:
                 table.write_lock.release()
-                log(f"RELEASED write lock on '{table.name}'.")
+                debug("RELEASED write lock on '%s'.", table.name)
             except threading.ThreadError:
-                log(f"Could not release lock on '{table.name}', already unlocked.")
+                log("Could not release lock on '%s', already unlocked.", table.name)
         else:
-            log(f"WARNING: '{connection.name}' tried to release lock on '{table.name}' which is not held.")
+            log("WARNING: '%s' tried to release lock on '%s' which is not held.", connection.name, table.name)
 
     def take_snapshot(self):
         if self.shutdown_event.is_set(): return
+        # An empty wait set means an empty Wait-For Graph, so no cycle is possible.
+        if not any(conn.lock_state[1] for conn in self.connections.values()):
+            log("No connection is waiting for a lock, skipping snapshot.")
+            return
         log("="*15 + " INITIATING GLOBAL SNAPSHOT " + "="*15)
-        with self.snapshot_lock:
-            snapshot_data = {}
-            for thread_id, conn_obj in self.connections.items():
-                snapshot_data[thread_id] = {
-                    'locked_tables': set(conn_obj.locked_tables),
-                    'waiting_for_table': conn_obj.waiting_for_table.name if conn_obj.waiting_for_table else None
-                }
+        snapshot_data = {}
+        for thread_id, conn_obj in self.connections.items():
+            locked_tables, waiting_for_table = conn_obj.lock_state
+            snapshot_data[thread_id] = ClientState(
+                locked_tables, waiting_for_table.name if waiting_for_table else None
+            )
         log("="*15 + " SNAPSHOT COMPLETE " + "="*19)
         self.deadlock_detector.analyze(snapshot_data)
 
@@ -68,8 +74,11 @@ class ClientConnection(threading.Thread):
         self.lock_manager = lock_manager
         self.all_tables = all_tables
         self.shutdown_event = shutdown_event
-        self.locked_tables = set()
-        self.waiting_for_table = None
+        # (locked tables, table being waited for). Only this connection's thread
+        # writes it, always swapping in a new tuple, so a snapshot reads both
+        # fields consistently in a single attribute load.
+        self.lock_state = (frozenset(), None)
+        self.rng = random.Random()
 
     def run(self):
         log("Connection established, starting workload.")
@@ -79,29 +88,31 @@ class ClientConnection(threading.Thread):
     def __perform_operation(self):
         if self.shutdown_event.is_set(): return
 
-        if random.random() > config.WRITE_PROBABILITY:
+        if self.rng.random() > config.WRITE_PROBABILITY:
             self.__perform_read()
         else:
             self.__perform_write_transaction()
 
         if not self.shutdown_event.is_set():
-            time.sleep(random.uniform(*config.CLIENT_COOLDOWN_RANGE))
+            time.sleep(self.rng.uniform(*config.CLIENT_COOLDOWN_RANGE))
 
     def __perform_read(self):
         if self.shutdown_event.is_set(): return
-        table_to_read = random.choice(self.all_tables)
-        read_duration = random.uniform(*config.READ_DURATION_RANGE)
-        log(f"Performing READ on '{table_to_read.name}' for {read_duration:.2f}s.")
+        table_to_read = self.rng.choice(self.all_tables)
+        read_duration = self.rng.uniform(*config.READ_DURATION_RANGE)
+        log("Performing READ on '%s' for %.2fs.", table_to_read.name, read_duration)
         time.sleep(read_duration)
 
     def __perform_write_transaction(self):
         if self.shutdown_event.is_set(): return
-        num_tables = 2 if random.random() < config.MULTI_TABLE_TX_PROBABILITY else 1
+        num_tables = 2 if self.rng.random() < config.MULTI_TABLE_TX_PROBABILITY else 1
         if num_tables > len(self.all_tables) or num_tables == 0: return
 
-        tables_to_lock = random.sample(self.all_tables, num_tables)
+        tables_to_lock = self.rng.sample(self.all_tables, num_tables)
+        if config.SAFE_LOCK_ORDER:
+            tables_to_lock.sort(key=lambda t: t.name)
         table_names = [t.name for t in tables_to_lock]
-        log(f"Starting WRITE transaction on table(s): {table_names}")
+        log("Starting WRITE transaction on table(s): %s", table_names)
 
         acquired_locks = []
         try:
@@ -111,14 +122,14 @@ class ClientConnection(threading.Thread):
                 if self.shutdown_event.is_set(): break
                 acquired_locks.append(table)
                 
-                if i == 0 and len(tables_to_lock) > 1:
-                    time.sleep(random.uniform(*config.DEADLOCK_WINDOW_RANGE))
+                if i == 0 and len(tables_to_lock) > 1 and not config.SAFE_LOCK_ORDER:
+                    time.sleep(self.rng.uniform(*config.DEADLOCK_WINDOW_RANGE))
             
             if not self.shutdown_event.is_set() and len(acquired_locks) == num_tables:
-                write_duration = random.uniform(*config.WRITE_DURATION_RANGE)
-                log(f"All locks acquired. Performing WRITE on {table_names} for {write_duration:.2f}s.")
+                write_duration = self.rng.uniform(*config.WRITE_DURATION_RANGE)
+                log("All locks acquired. Performing WRITE on %s for %.2fs.", table_names, write_duration)
                 time.sleep(write_duration)
         finally:
-            log(f"Finishing transaction, releasing locks for {table_names}.")
+            log("Finishing transaction, releasing locks for %s.", table_names)
             for table in reversed(acquired_locks):
                 self.lock_manager.release_lock(self, table.name)
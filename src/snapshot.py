@@ -1,10 +1,13 @@
 import threading
-import time
+from collections import namedtuple
 
-from src.utils import log
+from src.utils import alert, log
 from src.visualization import visualize_wait_for_graph
 
 
+ClientState = namedtuple("ClientState", ["locked_tables", "waiting_for_table"])
+
+
 class DeadlockDetector:
     def __init__(self, shutdown_event):
         self.shutdown_event = shutdown_event
@@ -16,16 +19,17 @@ class DeadlockDetector:
         log("Analyzing snapshot for deadlocks...")
         graph = self.__build_wait_for_graph(snapshot)
         if any(graph.values()):
-            log(f"Built Wait-For Graph: {graph}")
-            visualize_wait_for_graph(graph)  # Visualize the graph
+            log("Built Wait-For Graph: %s", graph)
+            visualize_wait_for_graph(graph)
 
         cycle = self.__find_cycle(graph)
 
         if cycle:
             log("=" * 40)
-            log("\033[91m!!! DEADLOCK DETECTED !!!\033[0m")
-            log(f"\033[91mDependency cycle found: {' -> '.join(cycle)}\033[0m")
-            visualize_wait_for_graph(graph, cycle=cycle)
+            alert("!!! DEADLOCK DETECTED !!!")
+            alert("Dependency cycle found: %s", " -> ".join(cycle))
+            # Keep the deadlock window open until the user closes it
+            visualize_wait_for_graph(graph, cycle=cycle, block=True)
             log("Initiating graceful shutdown of the application...")
             log("=" * 40)
             self.shutdown_event.set()
@@ -34,54 +38,77 @@ class DeadlockDetector:
 
     def __build_wait_for_graph(self, snapshot):
         graph = {thread_id: [] for thread_id in snapshot}
+        owners = {
+            table.name: thread_id
+            for thread_id, state in snapshot.items()
+            for table in state.locked_tables
+        }
         for thread_id, state in snapshot.items():
-            waiting_for_table_name = state["waiting_for_table"]
-            if waiting_for_table_name:
-                owner_found = None
-                for other_thread_id, other_state in snapshot.items():
-                    if waiting_for_table_name in [
-                        t.name for t in other_state["locked_tables"]
-                    ]:
-                        owner_found = other_thread_id
-                        break
-                if owner_found and owner_found != thread_id:
-                    graph[thread_id].append(owner_found)
+            owner = owners.get(state.waiting_for_table)
+            if owner and owner != thread_id:
+                graph[thread_id].append(owner)
         return graph
 
     def __find_cycle(self, graph):
-        visited = set()
-        recursion_stack = set()
-        for node in graph:
-            if node not in visited:
-                path = self.__dfs_cycle_util(node, graph, visited, recursion_stack)
-                if path:
-                    start_node = path[-1]
-                    try:
-                        cycle_start_index = path.index(start_node)
-                        return path[cycle_start_index:]
-                    except ValueError:
-                        return path
+        for component in self.__strongly_connected_components(graph):
+            if len(component) > 1:
+                return self.__cycle_in_component(component, graph)
         return None
 
-    def __dfs_cycle_util(self, node, graph, visited, recursion_stack, path=None):
-        if path is None:
-            path = []
-        visited.add(node)
-        recursion_stack.add(node)
-        path.append(node)
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                result = self.__dfs_cycle_util(
-                    neighbor, graph, visited, recursion_stack, path
-                )
-                if result:
-                    return result
-            elif neighbor in recursion_stack:
-                path.append(neighbor)
-                return path
-        recursion_stack.remove(node)
-        path.pop()
-        return None
+    def __strongly_connected_components(self, graph):
+        # Iterative Tarjan: linear in the size of the graph and not bound by
+        # the interpreter's recursion limit.
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in graph:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph.get(root, [])))]
+            while work:
+                node, neighbors = work[-1]
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = len(index)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(graph.get(neighbor, []))))
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+    def __cycle_in_component(self, component, graph):
+        # Every member of a non-trivial SCC has a successor inside it, so
+        # following those edges must eventually revisit a node.
+        members = set(component)
+        path = []
+        position = {}
+        node = component[0]
+        while node not in position:
+            position[node] = len(path)
+            path.append(node)
+            node = next(n for n in graph.get(node, []) if n in members)
+        return path[position[node]:] + [node]
 
 
 class Snapshotter(threading.Thread):
@@ -92,8 +119,6 @@ class Snapshotter(threading.Thread):
         self.shutdown_event = shutdown_event
 
     def run(self):
-        log(f"Monitoring started. Will take snapshots every {self.interval} seconds.")
-        while not self.shutdown_event.is_set():
-            time.sleep(self.interval)
-            if not self.shutdown_event.is_set():
-                self.lock_manager.take_snapshot()
+        log("Monitoring started. Will take snapshots every %s seconds.", self.interval)
+        while not self.shutdown_event.wait(self.interval):
+            self.lock_manager.take_snapshot()
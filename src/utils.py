@@ -1,7 +1,133 @@
-import time
+import atexit
+import logging
+import queue
+import sys
 import threading
+from logging.handlers import QueueHandler, QueueListener
 
-def log(message):
-    """Log function to print messages with a timestamp and the current thread's name."""
-    timestamp = time.strftime('%H:%M:%S', time.localtime())
-    print(f"[{timestamp}] [{threading.current_thread().name}] {message}")
+import config
+
+_logger = logging.getLogger("lamport")
+_listener = None
+_LOG_FORMAT = "[%(asctime)s] [%(threadName)s] %(message)s"
+_DATE_FORMAT = "%H:%M:%S"
+
+class _SecondCachingFormatter(logging.Formatter):
+    """
+    Reuses the formatted timestamp for every record created within the same second.
+    Only valid for date formats without sub-second fields, such as "%H:%M:%S".
+    """
+    def __init__(self, fmt, datefmt):
+        super().__init__(fmt, datefmt)
+        self._cached_second = None
+        self._cached_time = ""
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = super().formatTime(record, datefmt)
+            self._cached_second = second
+        return self._cached_time
+
+class _TerminalFormatter(_SecondCachingFormatter):
+    """
+    Shows records logged with alert() in red. Only used by the stdout handler, and
+    only when that stream is a terminal, so files and redirected output stay plain.
+    """
+    def format(self, record):
+        text = super().format(record)
+        if getattr(record, "highlight", False):
+            return f"\033[91m{text}\033[0m"
+        return text
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that drops records when the queue is full,
+    so a log flood costs a counter increment instead of unbounded memory.
+    handle() skips the handler lock so callers do not serialize on each other: the
+    queue and the drop counter synchronize themselves, and prepare() works on a copy
+    of the record with the stateless default formatter.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def handle(self, record):
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):  # Filters may return a replacement record (3.12+)
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Only the overflow path pays for this lock
+            with self._dropped_lock:
+                self.dropped += 1
+
+class _BlockingStopQueueListener(QueueListener):
+    """
+    QueueListener that waits for room in the bounded queue when enqueuing its stop
+    sentinel, so a full queue at exit cannot prevent the final flush.
+    """
+    def enqueue_sentinel(self):
+        # The listener keeps draining, so waiting for room cannot hang, while a
+        # put_nowait could fail on a full queue and leave records unflushed.
+        self.queue.put(self._sentinel)
+
+def setup_logging():
+    """
+    Configures the simulation logger. Calling threads only interpolate their message
+    and enqueue the record; the timestamp/layout formatting and the writes to stdout
+    (and to LOG_FILE, if set) happen on a single background listener thread.
+    Calling it again is a no-op.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    formatter = _SecondCachingFormatter(_LOG_FORMAT, datefmt=_DATE_FORMAT)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if stream_handler.stream.isatty():
+        stream_handler.setFormatter(_TerminalFormatter(_LOG_FORMAT, datefmt=_DATE_FORMAT))
+    else:
+        stream_handler.setFormatter(formatter)
+    handlers = [stream_handler]
+    if config.LOG_FILE:
+        file_handler = logging.FileHandler(config.LOG_FILE)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    log_queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+    queue_handler = _DroppingQueueHandler(log_queue)
+    _logger.setLevel(config.LOG_LEVEL)
+    _logger.propagate = False
+    _logger.addHandler(queue_handler)
+
+    _listener = _BlockingStopQueueListener(log_queue, *handlers)
+    _listener.start()
+    atexit.register(_stop_logging, _listener, queue_handler)
+
+def _stop_logging(listener, queue_handler):
+    """Drains the records still queued when the application exits and reports any dropped ones."""
+    listener.stop()
+    if queue_handler.dropped:
+        print(f"{queue_handler.dropped} log messages were dropped because the log queue was full.", file=sys.stderr)
+
+def log(message, *args):
+    """
+    Log function to print messages with a timestamp and the current thread's name.
+    Any extra arguments are %-formatted into the message only if it is actually emitted.
+    """
+    _logger.info(message, *args)
+
+def debug(message, *args):
+    """Same as log(), for high-frequency messages that are hidden unless LOG_LEVEL is "DEBUG"."""
+    _logger.debug(message, *args)
+
+def alert(message, *args):
+    """Same as log(), but the message is shown in red when stdout is a terminal."""
+    _logger.info(message, *args, extra={"highlight": True})
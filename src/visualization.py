@@ -1,28 +1,57 @@
+import functools
+
+import matplotlib
 import networkx as nx
+
+import config
+
+# Saving needs no window: switch to the non-GUI Agg backend so figures are
+# rendered off-screen, even from the DBA-Monitor thread. This must happen
+# before pyplot is imported.
+if config.GRAPH_SAVE_PATH:
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
 
 
-def visualize_wait_for_graph(graph, cycle=None):
+@functools.lru_cache(maxsize=8)
+def _circular_layout(nodes):
+    """Circular positions only depend on the ordered node set, which rarely changes between snapshots."""
+    return nx.circular_layout(nodes)
+
+
+def visualize_wait_for_graph(graph, cycle=None, block=False):
     """
     Visualizes the Wait-For Graph using networkx and matplotlib.
 
+    If config.GRAPH_SAVE_PATH is set, the figure is rendered off-screen (Agg backend,
+    chosen at import time) and saved to that file. Otherwise it is shown in a window;
+    note that the monitor calls this from the DBA-Monitor thread, which GUI backends
+    such as Tk and Qt do not support, and a non-blocking window only processes events
+    during its brief pause, so it stops responding between snapshots.
+
     Args:
         graph (dict): The Wait-For Graph where keys are thread IDs and values are lists of dependencies.
-        cycle (list): Optional list of nodes forming a cycle (deadlock).
+        cycle (list): Optional list of nodes forming a cycle (deadlock), with or without the first node repeated at the end.
+        block (bool): Whether to wait for the window to be closed before returning. Ignored when saving.
     """
     G = nx.DiGraph()
 
     # Add nodes and edges to the graph
-    for node, dependencies in graph.items():
-        G.add_node(node)
-        for dependency in dependencies:
-            G.add_edge(node, dependency)
+    G.add_nodes_from(graph)
+    G.add_edges_from(
+        (node, dependency)
+        for node, dependencies in graph.items()
+        for dependency in dependencies
+    )
 
     # Use a circular layout for better spacing
-    pos = nx.circular_layout(G)
+    pos = _circular_layout(tuple(G))
+
+    # Reuse the same window across calls instead of opening a new figure each time
+    plt.figure("Wait-For Graph", figsize=(12, 8)).clear()
 
     # Draw the graph
-    plt.figure(figsize=(12, 8))
     nx.draw(
         G,
         pos,
@@ -36,12 +65,12 @@ def visualize_wait_for_graph(graph, cycle=None):
 
     # Highlight the cycle if provided
     if cycle:
-        cycle_edges = [(cycle[i], cycle[i + 1]) for i in range(len(cycle) - 1)] + [
-            (cycle[-1], cycle[0])
-        ]
+        # The detector reports the cycle closed (A -> B -> A); close it if needed
+        closed_cycle = cycle if cycle[0] == cycle[-1] else cycle + cycle[:1]
+        cycle_edges = list(zip(closed_cycle, closed_cycle[1:]))
         nx.draw_networkx_edges(G, pos, edgelist=cycle_edges, edge_color="red", width=3)
         nx.draw_networkx_nodes(
-            G, pos, nodelist=cycle, node_color="orange", node_size=3000
+            G, pos, nodelist=closed_cycle[:-1], node_color="orange", node_size=3000
         )
         plt.title("Deadlock Detected: Cycle Highlighted", fontsize=16, color="red")
     else:
@@ -65,4 +94,10 @@ def visualize_wait_for_graph(graph, cycle=None):
         loc="upper left",
     )
 
-    plt.show()
+    if config.GRAPH_SAVE_PATH:
+        plt.savefig(config.GRAPH_SAVE_PATH, dpi=80)
+    elif block:
+        plt.show()
+    else:
+        plt.show(block=False)
+        plt.pause(0.001)  # Let the GUI draw the figure before returning